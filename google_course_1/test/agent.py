@@ -1,11 +1,16 @@
 from google.adk.agents import Agent
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from fastapi import FastAPI
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 from google.genai import types
 from dotenv import load_dotenv
 import uvicorn
+import functools
+from typing import Optional
 
 # Load environment variables from .env file
 load_dotenv()
@@ -18,8 +23,27 @@ root_agent = Agent(
     instruction='Answer user questions to the best of your knowledge',
 )
 
+class StreamSafeGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves Server-Sent Event routes (``*/stream``) uncompressed.
+
+    Older Starlette releases gzip text/event-stream too, which holds events in
+    the compressor and stops them reaching the client as they are produced.
+    """
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
 # Create FastAPI app
-app = FastAPI(title="Google ADK Agent API", description="FastAPI server for Google ADK agent")
+app = FastAPI(
+    title="Google ADK Agent API",
+    description="FastAPI server for Google ADK agent",
+    default_response_class=ORJSONResponse,
+)
+# Compress larger responses (long model answers); small JSON bodies and the
+# /run/stream events go out as-is
+app.add_middleware(StreamSafeGZipMiddleware, minimum_size=512)
 
 # Initialize session service and runner (correct way)
 session_service = InMemorySessionService()
@@ -29,24 +53,77 @@ runner = Runner(
     session_service=session_service,
 )
 
+# Ask the model for incremental chunks on /run/stream instead of whole responses
+_SSE_RUN_CONFIG = RunConfig(streaming_mode=StreamingMode.SSE)
+
+# (app_name, user_id, session_id) triples already created in this process
+_KNOWN_SESSIONS: set[tuple[str, str, str]] = set()
+
+# Limit in characters (Pydantic counts str length in code points, not bytes)
+MAX_MESSAGE_LENGTH = 8192
+
 # Define request/response models
 class ChatRequest(BaseModel):
-    message: str
+    # Prompts over MAX_MESSAGE_LENGTH characters are rejected with a 422
+    message: str = Field(max_length=MAX_MESSAGE_LENGTH)
     session_id: str = "default"
 
 class ChatResponse(BaseModel):
     response: str
     session_id: str
 
+# Repeated prompts ("ping", "hello", ...) reuse the same Content; it is only read downstream
+@functools.lru_cache(maxsize=1024)
+def _user_msg(text: str) -> types.Content:
+    """Build a user message without re-validating text already checked by ChatRequest."""
+    return types.Content.model_construct(
+        role="user",
+        parts=[types.Part.model_construct(text=text)]
+    )
+
+async def _collect_final(events) -> Optional[str]:
+    """Return the text of the first final response event, or None."""
+    async for event in events:
+        if event.is_final_response() and event.content and event.content.parts:
+            return event.content.parts[0].text
+    return None
+
+def _ensure_session(user_id: str, session_id: str):
+    """Create the session if needed, probing the service only the first time."""
+    session_key = ("FastAPI_Agent", user_id, session_id)
+    if session_key in _KNOWN_SESSIONS:
+        return
+    
+    # Try to get existing session
+    existing_session = session_service.get_session(
+        app_name="FastAPI_Agent",
+        user_id=user_id,
+        session_id=session_id
+    )
+    
+    # If session doesn't exist, create it
+    if existing_session is None:
+        session_service.create_session(
+            app_name="FastAPI_Agent",
+            user_id=user_id,
+            session_id=session_id,
+            state={}
+        )
+    _KNOWN_SESSIONS.add(session_key)
+
+def _sse(text: str) -> str:
+    """Frame text as a single Server-Sent Event, keeping multi-line text intact."""
+    return "".join(f"data: {line}\n" for line in text.split("\n")) + "\n"
+
 # Health check endpoint
 @app.get("/")
 async def health_check():
-    return {"status": "healthy", "agent": root_agent.name}
+    return ORJSONResponse({"status": "healthy", "agent": root_agent.name})
 
 # List apps endpoint (for compatibility with ADK web interface)
 @app.get("/list-apps")
 async def list_apps():
-    return {
+    return ORJSONResponse({
         "apps": [
             {
                 "name": root_agent.name,
@@ -54,67 +131,80 @@ async def list_apps():
                 "model": root_agent.model
             }
         ]
-    }
+    })
 
-# Main chat endpoint that handles the /run functionality
+# Main chat endpoint that handles the /run functionality (also served at /chat)
 @app.post("/run", response_model=ChatResponse)
+@app.post("/chat", response_model=ChatResponse)
 async def run_agent(request: ChatRequest):
+    # Nothing to ask the model
+    if not request.message.strip():
+        return ORJSONResponse(ChatResponse(
+            response="",
+            session_id=request.session_id
+        ).model_dump())
+    
     try:
         # Create session if it doesn't exist
         user_id = "default_user"
         session_id = request.session_id
-        
-        # Try to get existing session
-        existing_session = session_service.get_session(
-            app_name="FastAPI_Agent",
-            user_id=user_id,
-            session_id=session_id
-        )
-        
-        # If session doesn't exist, create it
-        if existing_session is None:
-            session_service.create_session(
-                app_name="FastAPI_Agent",
-                user_id=user_id,
-                session_id=session_id,
-                state={}
-            )
+        _ensure_session(user_id, session_id)
         
         # Create message content
-        new_message = types.Content(
-            role="user", 
-            parts=[types.Part(text=request.message)]
-        )
+        new_message = _user_msg(request.message)
         
         # Run the agent and collect response
-        final_response = None
-        async for event in runner.run_async(
+        final_response = await _collect_final(runner.run_async(
             user_id=user_id,
             session_id=session_id,
             new_message=new_message
-        ):
-            if event.is_final_response() and event.content and event.content.parts:
-                final_response = event.content.parts[0].text
-                break
+        ))
         
         if final_response is None:
             final_response = "No response generated"
         
-        return ChatResponse(
+        return ORJSONResponse(ChatResponse(
             response=final_response,
             session_id=request.session_id
-        )
+        ).model_dump())
         
     except Exception as e:
-        return ChatResponse(
+        return ORJSONResponse(ChatResponse(
             response=f"Error: {str(e)}",
             session_id=request.session_id
-        )
+        ).model_dump())
 
-# Alternative chat endpoint
-@app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
-    return await run_agent(request)
+# Streaming variant of /run: emits agent text as Server-Sent Events as it arrives
+@app.post("/run/stream")
+async def run_agent_stream(request: ChatRequest):
+    user_id = "default_user"
+    session_id = request.session_id
+    
+    async def event_stream():
+        if not request.message.strip():
+            return
+        
+        try:
+            _ensure_session(user_id, session_id)
+            new_message = _user_msg(request.message)
+            
+            async for event in runner.run_async(
+                user_id=user_id,
+                session_id=session_id,
+                new_message=new_message,
+                run_config=_SSE_RUN_CONFIG
+            ):
+                # Partial events carry the chunks; the closing non-partial event
+                # repeats the full text, so emitting it would send the answer twice
+                if event.partial and event.content and event.content.parts:
+                    text = "".join(part.text for part in event.content.parts if part.text)
+                    if text:
+                        yield _sse(text)
+        
+        except Exception as e:
+            yield _sse(f"Error: {str(e)}")
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8060)
@@ -1,102 +1,163 @@
 import yaml
 import os
+import functools
+import logging
 from pathlib import Path
+from pydantic import BaseModel
 from google.adk.agents import Agent
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from dotenv import load_dotenv
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+# Load environment variables once per process rather than on every loader
+load_dotenv()
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+class ToolSpec(BaseModel):
+    """A tool entry under ``agent.tools``."""
+    name: str
+    enabled: bool = False
+
+class AgentSpec(BaseModel):
+    """The ``agent`` section of the YAML configuration."""
+    name: str = 'yaml_agent'
+    model: str = 'gemini-2.0-flash'
+    description: str = 'YAML configured agent'
+    instruction: str = 'You are a helpful assistant.'
+    settings: dict = {}
+    tools: list[ToolSpec] = []
+
+class EnvironmentSpec(BaseModel):
+    """The ``environment`` section of the YAML configuration."""
+    api_key_env_var: str = 'GOOGLE_API_KEY'
+    session_management: str = 'in_memory'
+    logging_level: str = 'INFO'
+
+class ServerSpec(BaseModel):
+    """The ``server`` section of the YAML configuration."""
+    host: str = '0.0.0.0'
+    port: int = 8000
+    workers: int = 1
+    title: str = 'YAML Configured Agent'
+    description: str = 'Agent configured via YAML'
+
+class AgentConfig(BaseModel):
+    """Validated YAML configuration; missing sections fall back to defaults."""
+    agent: AgentSpec = AgentSpec()
+    environment: EnvironmentSpec = EnvironmentSpec()
+    server: ServerSpec = ServerSpec()
+
+@functools.lru_cache(maxsize=8)
+def _parse_config(path: str, mtime_ns: int) -> AgentConfig:
+    """Parse and validate a YAML file, cached per (path, mtime) so reloads only happen on change."""
+    with open(path, 'r') as file:
+        return AgentConfig.model_validate(yaml.load(file, Loader=SafeLoader) or {})
+
+@functools.lru_cache(maxsize=None)
+def _check_env_var(name: str) -> bool:
+    """Check an environment variable once per process, warning if it is unset."""
+    if os.environ.get(name):
+        return True
+    logger.warning("%s environment variable not set", name)
+    return False
+
+def get_current_time() -> dict:
+    """Get the current time in ISO format."""
+    return {
+        "current_time": datetime.now().isoformat(),
+        "timezone": "UTC"
+    }
+
 class YAMLAgentLoader:
     """Load and create ADK agents from YAML configuration files."""
     
     def __init__(self, config_path: str):
         self.config_path = Path(config_path)
         self.config = self._load_config()
+        self._session_service: InMemorySessionService | None = None
+        self._agent: Agent | None = None
         
-    def _load_config(self) -> dict:
+    def _load_config(self) -> AgentConfig:
         """Load YAML configuration from file."""
         if not self.config_path.exists():
             raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
             
-        with open(self.config_path, 'r') as file:
-            return yaml.safe_load(file)
+        return _parse_config(
+            str(self.config_path.resolve()),
+            self.config_path.stat().st_mtime_ns
+        )
     
     def _setup_environment(self):
         """Setup environment variables and configurations."""
-        load_dotenv()
-        
         # Set up environment variables from config
-        env_config = self.config.get('environment', {})
-        api_key_var = env_config.get('api_key_env_var', 'GOOGLE_API_KEY')
-        
-        if not os.getenv(api_key_var):
-            print(f"Warning: {api_key_var} environment variable not set")
+        _check_env_var(self.config.environment.api_key_env_var)
+    
+    # Tool name in YAML -> tool function (add more tools as needed)
+    _TOOLS = {
+        'get_current_time': get_current_time,
+    }
+    
+    @functools.cached_property
+    def _tools(self) -> list:
+        """Tools enabled in the YAML configuration, built once per loader."""
+        return [
+            self._TOOLS[tool.name]
+            for tool in self.config.agent.tools
+            if tool.enabled and tool.name in self._TOOLS
+        ]
     
     def _create_tools(self) -> list:
         """Create tools based on YAML configuration."""
-        tools = []
-        tool_configs = self.config.get('agent', {}).get('tools', [])
-        
-        for tool_config in tool_configs:
-            if tool_config.get('enabled', False):
-                tool_name = tool_config.get('name')
-                if tool_name == 'get_current_time':
-                    tools.append(self._get_current_time_tool())
-                # Add more tools as needed
-                
-        return tools
-    
-    def _get_current_time_tool(self):
-        """Create a current time tool."""
-        def get_current_time() -> dict:
-            """Get the current time in ISO format."""
-            return {
-                "current_time": datetime.now().isoformat(),
-                "timezone": "UTC"
-            }
-        return get_current_time
+        return list(self._tools)
     
     def create_agent(self) -> Agent:
-        """Create an ADK Agent from YAML configuration."""
+        """Create an ADK Agent from YAML configuration (built once per loader)."""
+        if self._agent is not None:
+            return self._agent
+        
         self._setup_environment()
         
-        agent_config = self.config.get('agent', {})
+        agent_config = self.config.agent
         tools = self._create_tools()
         
-        agent = Agent(
-            name=agent_config.get('name', 'yaml_agent'),
-            model=agent_config.get('model', 'gemini-2.0-flash'),
-            description=agent_config.get('description', 'YAML configured agent'),
-            instruction=agent_config.get('instruction', 'You are a helpful assistant.'),
+        self._agent = Agent(
+            name=agent_config.name,
+            model=agent_config.model,
+            description=agent_config.description,
+            instruction=agent_config.instruction,
             tools=tools
         )
         
-        return agent
+        return self._agent
     
     def create_runner(self, agent: Agent = None) -> Runner:
         """Create a Runner with the configured agent."""
         if agent is None:
             agent = self.create_agent()
             
-        session_service = InMemorySessionService()
+        # Share one session service across every runner from this loader
+        if self._session_service is None:
+            self._session_service = InMemorySessionService()
         
         runner = Runner(
             agent=agent,
-            app_name=self.config.get('agent', {}).get('name', 'yaml_agent'),
-            session_service=session_service
+            app_name=self.config.agent.name,
+            session_service=self._session_service
         )
         
         return runner
     
-    def get_server_config(self) -> dict:
+    def get_server_config(self) -> ServerSpec:
         """Get server configuration from YAML."""
-        return self.config.get('server', {
-            'host': '0.0.0.0',
-            'port': 8000,
-            'title': 'YAML Configured Agent',
-            'description': 'Agent configured via YAML'
-        })
+        return self.config.server
 
 # Create the agent using YAML configuration
 def load_agent_from_yaml(config_path: str = "agent_config.yaml"):
@@ -2,14 +2,18 @@
 Comparison: Agent with Runner vs Agent without Runner
 """
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from google.adk.agents import Agent
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
-from google.genai import types
 from dotenv import load_dotenv
 import uvicorn
 
+from schemas import ChatRequest
+from utils import collect_final, ensure_session, user_msg, RESPONSE_CACHE, cache_key
+
 load_dotenv()
 
 # Same agent for both approaches
@@ -20,11 +24,9 @@ agent = Agent(
     instruction='You are a helpful assistant. Remember previous conversations when using sessions.',
 )
 
-app = FastAPI(title="Runner vs Direct Comparison")
-
-class ChatRequest(BaseModel):
-    message: str
-    session_id: str = "default"
+app = FastAPI(title="Runner vs Direct Comparison", default_response_class=ORJSONResponse)
+# Compress larger responses (long model answers); small JSON bodies go out as-is
+app.add_middleware(GZipMiddleware, minimum_size=512)
 
 class ChatResponse(BaseModel):
     response: str
@@ -35,27 +37,46 @@ class ChatResponse(BaseModel):
 @app.post("/direct", response_model=ChatResponse)
 async def chat_direct(request: ChatRequest):
     """Direct agent call - NO memory between requests"""
+    # Nothing to ask the model
+    if not request.message.strip():
+        return ORJSONResponse(ChatResponse(
+            response="",
+            has_memory=False,
+            approach="direct_agent"
+        ).model_dump())
+    
     try:
-        message_content = types.Content(
-            role="user", 
-            parts=[types.Part(text=request.message)]
-        )
+        # Stateless, so identical prompts can be answered from the cache
+        key = cache_key(agent.name, request.message)
+        cached = RESPONSE_CACHE.get(key)
+        if cached is not None:
+            return ORJSONResponse(ChatResponse(
+                response=cached,
+                has_memory=False,
+                approach="direct_agent"
+            ).model_dump())
+        
+        message_content = user_msg(request.message)
         
         response = await agent.run_async([message_content])
-        response_text = response.parts[0].text if response and response.parts else "No response"
+        if response and response.parts:
+            response_text = response.parts[0].text
+            RESPONSE_CACHE[key] = response_text
+        else:
+            response_text = "No response"
         
-        return ChatResponse(
+        return ORJSONResponse(ChatResponse(
             response=response_text,
             has_memory=False,
             approach="direct_agent"
-        )
+        ).model_dump())
         
     except Exception as e:
-        return ChatResponse(
+        return ORJSONResponse(ChatResponse(
             response=f"Error: {str(e)}",
             has_memory=False,
             approach="direct_agent"
-        )
+        ).model_dump())
 
 # APPROACH 2: With Runner (Stateful)
 session_service = InMemorySessionService()
@@ -68,42 +89,43 @@ runner = Runner(
 @app.post("/runner", response_model=ChatResponse)
 async def chat_with_runner(request: ChatRequest):
     """Runner-based call - HAS memory between requests"""
+    # Nothing to ask the model
+    if not request.message.strip():
+        return ORJSONResponse(ChatResponse(
+            response="",
+            has_memory=True,
+            approach="runner_based"
+        ).model_dump())
+    
     try:
         user_id = "test_user"
         session_id = request.session_id
         
         # Create session if needed
-        existing_session = session_service.get_session("ComparisonApp", user_id, session_id)
-        if existing_session is None:
-            session_service.create_session("ComparisonApp", user_id, session_id, state={})
+        ensure_session(session_service, "ComparisonApp", user_id, session_id)
         
-        message_content = types.Content(
-            role="user", 
-            parts=[types.Part(text=request.message)]
-        )
+        message_content = user_msg(request.message)
         
-        final_response = None
-        async for event in runner.run_async(user_id, session_id, message_content):
-            if event.is_final_response() and event.content and event.content.parts:
-                final_response = event.content.parts[0].text
-                break
+        final_response = await collect_final(
+            runner.run_async(user_id, session_id, message_content)
+        )
         
-        return ChatResponse(
+        return ORJSONResponse(ChatResponse(
             response=final_response or "No response",
             has_memory=True,
             approach="runner_based"
-        )
+        ).model_dump())
         
     except Exception as e:
-        return ChatResponse(
+        return ORJSONResponse(ChatResponse(
             response=f"Error: {str(e)}",
             has_memory=True,
             approach="runner_based"
-        )
+        ).model_dump())
 
 @app.get("/")
 async def info():
-    return {
+    return ORJSONResponse({
         "message": "Compare /direct vs /runner endpoints",
         "test_instructions": [
             "1. POST to /direct with: {'message': 'My name is John'}",
@@ -112,7 +134,7 @@ async def info():
             "4. POST to /runner with: {'message': 'What is my name?', 'session_id': 'test1'}",
             "Notice: Direct forgets, Runner remembers!"
         ]
-    }
+    })
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8002)
\ No newline at end of file
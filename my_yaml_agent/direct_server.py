@@ -2,11 +2,16 @@
 FastAPI server using ADK Agent directly (no Runner)
 """
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from google.adk.agents import Agent
-from google.genai import types
 from dotenv import load_dotenv
 import uvicorn
+import os
+
+from schemas import ChatRequest
+from utils import user_msg, RESPONSE_CACHE, cache_key
 
 # Load environment variables
 load_dotenv()
@@ -20,27 +25,37 @@ agent = Agent(
 )
 
 # Create FastAPI app
-app = FastAPI(title="Direct Agent API", description="FastAPI without Runner")
-
-# Request/Response models
-class ChatRequest(BaseModel):
-    message: str
+app = FastAPI(
+    title="Direct Agent API",
+    description="FastAPI without Runner",
+    default_response_class=ORJSONResponse,
+)
+# Compress larger responses (long model answers); small JSON bodies go out as-is
+app.add_middleware(GZipMiddleware, minimum_size=512)
 
+# Response model (requests use the shared ChatRequest)
 class ChatResponse(BaseModel):
     response: str
 
 @app.get("/")
 async def health_check():
-    return {"status": "healthy", "agent": agent.name, "uses_runner": False}
+    return ORJSONResponse({"status": "healthy", "agent": agent.name, "uses_runner": False})
 
 @app.post("/chat", response_model=ChatResponse)
 async def chat_direct(request: ChatRequest):
+    # Nothing to ask the model
+    if not request.message.strip():
+        return ORJSONResponse(ChatResponse(response="").model_dump())
+    
     try:
+        # Serve repeated prompts without calling the model
+        key = cache_key(agent.name, request.message)
+        cached = RESPONSE_CACHE.get(key)
+        if cached is not None:
+            return ORJSONResponse(ChatResponse(response=cached).model_dump())
+        
         # Create message content directly
-        message_content = types.Content(
-            role="user", 
-            parts=[types.Part(text=request.message)]
-        )
+        message_content = user_msg(request.message)
         
         # Call agent directly (no Runner needed!)
         response = await agent.run_async([message_content])
@@ -48,13 +63,22 @@ async def chat_direct(request: ChatRequest):
         # Extract response text
         if response and response.parts:
             response_text = response.parts[0].text
+            RESPONSE_CACHE[key] = response_text
         else:
             response_text = "No response generated"
         
-        return ChatResponse(response=response_text)
+        return ORJSONResponse(ChatResponse(response=response_text).model_dump())
         
     except Exception as e:
-        return ChatResponse(response=f"Error: {str(e)}")
+        return ORJSONResponse(ChatResponse(response=f"Error: {str(e)}").model_dump())
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    # Stateless, so requests can be spread across worker processes;
+    # each worker imports this module and builds its own agent
+    workers = max(2, (os.cpu_count() or 1) // 2)
+    uvicorn.run(
+        "direct_server:app",
+        host="0.0.0.0",
+        port=8001,
+        workers=workers
+    )
\ No newline at end of file
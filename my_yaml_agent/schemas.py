@@ -0,0 +1,16 @@
+"""
+Request/response models shared by the FastAPI servers
+"""
+from pydantic import BaseModel, Field
+
+# Limit in characters (Pydantic counts str length in code points, not bytes)
+MAX_MESSAGE_LENGTH = 8192
+
+class ChatRequest(BaseModel):
+    # Prompts over MAX_MESSAGE_LENGTH characters are rejected with a 422
+    message: str = Field(max_length=MAX_MESSAGE_LENGTH)
+    session_id: str = "default"
+
+class ChatResponse(BaseModel):
+    response: str
+    session_id: str
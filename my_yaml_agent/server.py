@@ -2,114 +2,134 @@
 YAML-based FastAPI server for ADK Agent
 """
 from fastapi import FastAPI
-from pydantic import BaseModel
-from google.genai import types
+from fastapi.responses import ORJSONResponse, StreamingResponse
 import uvicorn
 from pathlib import Path
 
-# Import our YAML agent loader
-from agent import YAMLAgentLoader
+# Import our YAML agent loader and the agent it already built on import
+from agent import YAMLAgentLoader, root_agent as agent
+from schemas import ChatRequest, ChatResponse
+from utils import (
+    StreamSafeGZipMiddleware,
+    collect_final,
+    ensure_session,
+    sse_event,
+    stream_sse,
+    user_msg,
+)
 
 # Load configuration
 config_file = Path(__file__).parent / "agent_config.yaml"
 loader = YAMLAgentLoader(config_file)
 
-# Create agent and runner from YAML config
-agent = loader.create_agent()
+# Create runner from YAML config, reusing the imported agent
 runner = loader.create_runner(agent)
 server_config = loader.get_server_config()
 
 # Create FastAPI app with config from YAML
 app = FastAPI(
-    title=server_config.get('title', 'YAML Agent API'),
-    description=server_config.get('description', 'ADK Agent configured via YAML')
+    title=server_config.title,
+    description=server_config.description,
+    default_response_class=ORJSONResponse,
 )
-
-# Request/Response models
-class ChatRequest(BaseModel):
-    message: str
-    session_id: str = "default"
-
-class ChatResponse(BaseModel):
-    response: str
-    session_id: str
+# Compress larger responses (long model answers); small JSON bodies and the
+# /run/stream events go out as-is
+app.add_middleware(StreamSafeGZipMiddleware, minimum_size=512)
 
 @app.get("/")
 async def health_check():
-    return {
+    return ORJSONResponse({
         "status": "healthy", 
         "agent": agent.name,
         "configured_via": "YAML"
-    }
+    })
 
 @app.get("/config")
 async def get_config():
     """Return current agent configuration from YAML"""
-    return {
+    return ORJSONResponse({
         "agent_name": agent.name,
         "model": agent.model,
         "description": agent.description,
         "tools_enabled": len(agent.tools) if hasattr(agent, 'tools') else 0,
         "config_source": "agent_config.yaml"
-    }
+    })
 
 @app.post("/run", response_model=ChatResponse)
 async def run_agent(request: ChatRequest):
+    # Nothing to ask the model
+    if not request.message.strip():
+        return ORJSONResponse(ChatResponse(
+            response="",
+            session_id=request.session_id
+        ).model_dump())
+    
     try:
         user_id = "default_user"
         session_id = request.session_id
         
         # Session management
-        existing_session = runner.session_service.get_session(
-            app_name=runner.app_name,
-            user_id=user_id,
-            session_id=session_id
-        )
-        
-        if existing_session is None:
-            runner.session_service.create_session(
-                app_name=runner.app_name,
-                user_id=user_id,
-                session_id=session_id,
-                state={}
-            )
+        ensure_session(runner.session_service, runner.app_name, user_id, session_id)
         
         # Create message and run agent
-        new_message = types.Content(
-            role="user", 
-            parts=[types.Part(text=request.message)]
-        )
+        new_message = user_msg(request.message)
         
-        final_response = None
-        async for event in runner.run_async(
+        final_response = await collect_final(runner.run_async(
             user_id=user_id,
             session_id=session_id,
             new_message=new_message
-        ):
-            if event.is_final_response() and event.content and event.content.parts:
-                final_response = event.content.parts[0].text
-                break
+        ))
         
         if final_response is None:
             final_response = "No response generated"
         
-        return ChatResponse(
+        return ORJSONResponse(ChatResponse(
             response=final_response,
             session_id=request.session_id
-        )
+        ).model_dump())
         
     except Exception as e:
-        return ChatResponse(
+        return ORJSONResponse(ChatResponse(
             response=f"Error: {str(e)}",
             session_id=request.session_id
-        )
+        ).model_dump())
+
+# Streaming variant of /run: emits agent text as Server-Sent Events as it arrives
+@app.post("/run/stream")
+async def run_agent_stream(request: ChatRequest):
+    user_id = "default_user"
+    session_id = request.session_id
+    
+    async def event_stream():
+        if not request.message.strip():
+            return
+        
+        try:
+            ensure_session(runner.session_service, runner.app_name, user_id, session_id)
+            new_message = user_msg(request.message)
+            
+            async for frame in stream_sse(runner, user_id, session_id, new_message):
+                yield frame
+        
+        except Exception as e:
+            yield sse_event(f"Error: {str(e)}")
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 if __name__ == "__main__":
     # Use server config from YAML
-    host = server_config.get('host', '0.0.0.0')
-    port = server_config.get('port', 8000)
+    host = server_config.host
+    port = server_config.port
+    # Sessions live in memory per process, so only scale out when configured
+    workers = server_config.workers
     
     print(f"Starting YAML-configured agent: {agent.name}")
     print(f"Server config loaded from: agent_config.yaml")
     
-    uvicorn.run(app, host=host, port=port)
\ No newline at end of file
+    # Worker processes need an import string to build their own app
+    uvicorn.run(
+        app if workers == 1 else "server:app",
+        host=host,
+        port=port,
+        workers=workers
+    )
\ No newline at end of file
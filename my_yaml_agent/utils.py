@@ -0,0 +1,99 @@
+"""
+Helpers shared by the my_yaml_agent FastAPI servers
+"""
+import functools
+from typing import Optional
+
+from cachetools import LRUCache
+from fastapi.middleware.gzip import GZipMiddleware
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.genai import types
+
+# Exact-match cache of answers for the stateless direct endpoints
+RESPONSE_CACHE: LRUCache = LRUCache(maxsize=1024)
+
+# Ask the model for incremental chunks instead of whole responses
+_SSE_RUN_CONFIG = RunConfig(streaming_mode=StreamingMode.SSE)
+
+# (app_name, user_id, session_id) triples already created in this process
+_KNOWN_SESSIONS: set[tuple[str, str, str]] = set()
+
+
+def ensure_session(session_service, app_name, user_id, session_id):
+    """Create the session if needed, probing the service only the first time."""
+    session_key = (app_name, user_id, session_id)
+    if session_key in _KNOWN_SESSIONS:
+        return
+
+    existing_session = session_service.get_session(
+        app_name=app_name, user_id=user_id, session_id=session_id
+    )
+    if existing_session is None:
+        session_service.create_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, state={}
+        )
+    _KNOWN_SESSIONS.add(session_key)
+
+
+@functools.lru_cache(maxsize=1024)
+def user_msg(text: str) -> types.Content:
+    """Build a user message, reusing one Content per distinct text.
+
+    Uses model_construct because ChatRequest has already validated the text;
+    sharing the object is safe since the runner and agent only read it.
+    """
+    return types.Content.model_construct(
+        role="user", parts=[types.Part.model_construct(text=text)]
+    )
+
+
+def cache_key(agent_name: str, message: str) -> tuple[str, str]:
+    """Key a prompt per agent, collapsing whitespace so spacing-only variants match.
+
+    Case is kept: prompts like "What does US mean?" and "what does us mean?"
+    can need different answers.
+    """
+    return agent_name, " ".join(message.split())
+
+
+def sse_event(text: str) -> str:
+    """Frame text as a single Server-Sent Event, keeping multi-line text intact."""
+    return "".join(f"data: {line}\n" for line in text.split("\n")) + "\n"
+
+
+async def stream_sse(runner, user_id, session_id, new_message):
+    """Yield the agent's answer as Server-Sent Events while the model generates it."""
+    async for event in runner.run_async(
+        user_id=user_id,
+        session_id=session_id,
+        new_message=new_message,
+        run_config=_SSE_RUN_CONFIG,
+    ):
+        # Partial events carry the chunks; the closing non-partial event repeats
+        # the full text, so emitting it would send the answer twice
+        if event.partial and event.content and event.content.parts:
+            text = "".join(part.text for part in event.content.parts if part.text)
+            if text:
+                yield sse_event(text)
+
+
+async def collect_final(events) -> Optional[str]:
+    """Return the text of the first final response event, or None."""
+    async for event in events:
+        if event.is_final_response() and event.content and event.content.parts:
+            return event.content.parts[0].text
+    return None
+
+
+class StreamSafeGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves Server-Sent Event routes (``*/stream``) uncompressed.
+
+    Older Starlette releases gzip text/event-stream too, which holds events in
+    the compressor and stops them reaching the client as they are produced.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)